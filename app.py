@@ -1,49 +1,147 @@
 # app.py
 from __future__ import annotations
 
+import asyncio
+import atexit
+import contextlib
 import datetime as dt
-from typing import Dict, Any, List
+import itertools
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Mapping, Sequence, Tuple
 import os
 import re
-from PIL import Image
+import threading
 import json
 
+import numpy as np
 import pandas as pd
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
 
-from ontology_engine import OntologyEngine
-from question_bank import QUESTIONS
+from ontology_engine import AssessmentInfo, LazyTaskInfo, ObjectiveInfo, get_engine
+from question_bank import QUESTIONS, QUESTIONS_BY_OBJECTIVE
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+    from PIL import Image
+
+# Technical ontology names such as "ObjTrainGCNModel"
+_OBJ_RE = re.compile(r'Obj[A-Z][a-zA-Z0-9]+')
+# Patterns for parsing numbered AI practice-question blocks
+_QBLOCK_SPLIT_RE = re.compile(r'\n\d+\. ')
+_CORRECT_STRIP_RE = re.compile(r'\nCorrect[:\-].*', re.IGNORECASE | re.DOTALL)
+_CORRECT_OPT_RE = re.compile(r'Correct[:\-].*', re.IGNORECASE)
+_MARK_RE = re.compile(r'Mark\s*[:\-]?\s*(\d)')
+
+
+def _mentions_obj_name(text: str) -> bool:
+    """True if ``text`` contains an ontology name like ObjTrainGCNModel."""
+    # Substring test first: most text has no "Obj" and never reaches the regex
+    return "Obj" in text and _OBJ_RE.search(text) is not None
+
 
 # ==================== AI API Configuration ====================
-def get_ai_api_config():
-    """Get AI API configuration from secrets or environment."""
+AI_MODEL = "gpt-3.5-turbo"
+# Completion-token ceiling of AI_MODEL; larger max_tokens requests are rejected
+_MAX_COMPLETION_TOKENS = 4096
+# Structured-output mode: responses are always a single valid JSON object
+_JSON_MODE = {"type": "json_object"}
+
+
+@st.cache_resource(show_spinner=False)
+def get_ai_api_config() -> Mapping[str, Any]:
+    """Get AI API configuration from secrets or environment.
+
+    The result is computed once per process (not per script rerun) and
+    returned as a read-only mapping.
+    """
     # Always use OpenAI as provider and get key from .env or environment
-    import dotenv
-    dotenv.load_dotenv()
+    try:
+        import dotenv
+        dotenv.load_dotenv()
+    except ImportError:
+        pass
     api_key = os.getenv("OPENAI_API_KEY", "")
     config = {
         "provider": "openai",
         "api_key": api_key,
         "enabled": bool(api_key)
     }
-    return config
+    return MappingProxyType(config)
+
+
+def _new_client(provider: str, api_key: str):
+    if provider == "openai":
+        import httpx
+        import openai
+        return openai.OpenAI(
+            api_key=api_key,
+            http_client=httpx.Client(
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=30)
+            ),
+        )
+    raise ValueError(f"Unsupported AI provider: {provider}")
+
+
+@st.cache_resource(show_spinner=False)
+def _client_pool() -> Tuple[Dict[Tuple[str, str], Any], threading.Lock]:
+    """Process-wide API clients keyed by (provider, api_key), plus their lock."""
+    pool: Dict[Tuple[str, str], Any] = {}
+    lock = threading.Lock()
+
+    def _close_all():
+        with lock:
+            for client in pool.values():
+                client.close()
+            pool.clear()
+
+    atexit.register(_close_all)
+    return pool, lock
+
+
+def _get_client(provider: str, api_key: str):
+    """Return the pooled client for a provider, creating it on first use."""
+    pool, lock = _client_pool()
+    key = (provider, api_key)
+    client = pool.get(key)
+    if client is None:
+        with lock:
+            client = pool.get(key)
+            if client is None:
+                client = pool[key] = _new_client(provider, api_key)
+    return client
+
+
+@st.cache_resource(show_spinner=False)
+def _prewarm_ai_connection() -> None:
+    """Open the pooled client's TCP/TLS connection in the background, once per process.
+
+    The first AI request of a session then skips DNS and handshake latency.
+    Failures are ignored: the real request will surface any problem.
+    """
+    config = get_ai_api_config()
+    try:
+        # Resolved here: the cached pool needs this thread's script run context
+        client = _get_client(config["provider"], config["api_key"])
+    except Exception:
+        return
+
+    def _ping():
+        try:
+            client.models.list()
+        except Exception:
+            pass
+
+    threading.Thread(target=_ping, daemon=True).start()
 
 
 def call_ai_api(prompt: str, max_tokens: int = 500) -> str | None:
     """Call AI API for insights and question generation."""
     config = get_ai_api_config()
-    
-    if not config["enabled"]:
-        return None
-    
     try:
         if config["provider"] == "openai":
-            import openai
-            client = openai.OpenAI(api_key=config["api_key"])
+            client = _get_client(config["provider"], config["api_key"])
             response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
+                model=AI_MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=max_tokens,
                 temperature=0.7
@@ -57,13 +155,70 @@ def call_ai_api(prompt: str, max_tokens: int = 500) -> str | None:
     return None
 
 
-def generate_ai_question(concept_name: str, difficulty: str = "medium") -> Dict[str, Any] | None:
-    """Generate an AI-powered practice question."""
+@st.cache_data(ttl=3600, max_entries=512, show_spinner=False)
+def _cached_ai_call_impl(prompt: str, max_tokens: int, model: str) -> str:
+    """Cached call_ai_api; ``model`` only keys the cache."""
+    response = call_ai_api(prompt, max_tokens=max_tokens)
+    if response is None:
+        # Raise rather than return None so failures are not cached
+        raise ValueError("empty AI response")
+    return response
+
+
+def cached_ai_call(prompt: str, max_tokens: int = 500) -> str | None:
+    """call_ai_api for prompts whose answer can be reused, e.g. model answers."""
+    try:
+        return _cached_ai_call_impl(prompt, max_tokens, AI_MODEL)
+    except ValueError:
+        return None
+
+
+def call_ai_api_json(prompt: str, max_tokens: int = 500) -> Dict[str, Any] | None:
+    """Call AI API in JSON mode and return the parsed response object.
+
+    The prompt must mention JSON; the model is then guaranteed to answer with a
+    single valid JSON object, so no text extraction is needed.
+    """
     config = get_ai_api_config()
-    if not config["enabled"]:
+    try:
+        client = _get_client(config["provider"], config["api_key"])
+        response = client.chat.completions.create(
+            model=AI_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=0.7,
+            response_format=_JSON_MODE
+        )
+        return json.loads(response.choices[0].message.content)
+    except Exception as e:
+        st.warning(f"AI API error: {str(e)}")
         return None
-    
-    prompt = f"""Generate a {difficulty} difficulty multiple choice question about {concept_name}.
+
+
+def stream_ai_api(prompt: str, max_tokens: int = 500) -> Iterator[str]:
+    """Stream an AI response chunk by chunk, for use with st.write_stream."""
+    config = get_ai_api_config()
+    try:
+        client = _get_client(config["provider"], config["api_key"])
+        stream = client.chat.completions.create(
+            model=AI_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=0.7,
+            stream=True
+        )
+        try:
+            for chunk in stream:
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content or ""
+        finally:
+            stream.close()
+    except Exception as e:
+        st.warning(f"AI API error: {str(e)}")
+
+
+def _ai_question_prompt(concept_name: str, difficulty: str) -> str:
+    return f"""Generate a {difficulty} difficulty multiple choice question about {concept_name}.
     
     Response format (JSON):
     {{
@@ -71,37 +226,188 @@ def generate_ai_question(concept_name: str, difficulty: str = "medium") -> Dict[
         "options": ["Option A", "Option B", "Option C", "Option D"],
         "correct_idx": 0,
         "explanation": "Why this is correct..."
-    }}
-    
-    Return only valid JSON, no additional text."""
-    
+    }}"""
+
+
+@st.cache_data(ttl=3600, max_entries=512, show_spinner=False)
+def _generate_ai_question_impl(concept_name: str, difficulty: str, seed: int) -> Dict[str, Any]:
+    """Cached question generation; ``seed`` only distinguishes cache slots."""
+    prompt = _ai_question_prompt(concept_name, difficulty)
+    question = call_ai_api_json(prompt, max_tokens=300)
+    if question is None:
+        # Raise rather than return None so failures are not cached
+        raise ValueError("no question in AI response")
+    return question
+
+
+def generate_ai_question(concept_name: str, difficulty: str = "medium", seed: int = 0) -> Dict[str, Any] | None:
+    """Generate an AI-powered practice question."""
     try:
-        response = call_ai_api(prompt, max_tokens=300)
-        if response:
-            # Extract JSON from response
-            start = response.find('{')
-            end = response.rfind('}') + 1
-            if start >= 0 and end > start:
-                json_str = response[start:end]
-                return json.loads(json_str)
+        return _generate_ai_question_impl(concept_name, difficulty, seed)
     except Exception as e:
         st.warning(f"Failed to generate question: {str(e)}")
     
     return None
 
 
-def generate_ai_insights(history: List[Dict], performance_data: Dict) -> str | None:
-    """Generate AI-powered learning insights."""
+def generate_ai_questions_batch(
+    topic: str, difficulty: str, n: int, asked: List[str], question_format: str
+) -> str | None:
+    """Ask for ``n`` more practice questions on ``topic`` in a single request.
+
+    The reply uses the same numbered MC/Theory text format as the bulk
+    practice prompt, so it is parsed by the same block parser.
+    """
+    prompt = (
+        f"Generate {n} additional unique questions (mix of MC and Theory) on the topic: '{topic}'. "
+        f"Do not repeat any of these questions: {'; '.join(asked)}. "
+        f"Questions must be plausible and use conceptual language, not technical names. {question_format} Difficulty: {difficulty}."
+    )
+    return call_ai_api(prompt, max_tokens=150 * n)
+
+
+async def acall_ai_api(
+    client, prompt: str, max_tokens: int = 500,
+    sem: asyncio.Semaphore | None = None, json_mode: bool = False
+) -> str | None:
+    """Async counterpart of call_ai_api for an ``openai.AsyncOpenAI`` client."""
+    extra = {"response_format": _JSON_MODE} if json_mode else {}
+    async with sem or contextlib.nullcontext():
+        response = await client.chat.completions.create(
+            model=AI_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=0.7,
+            **extra
+        )
+    return response.choices[0].message.content
+
+
+def call_ai_api_many(
+    prompts: List[str], max_tokens: int = 500, json_mode: bool = False, max_concurrency: int = 10
+) -> List[str | None]:
+    """Send several prompts concurrently and return the responses in order.
+
+    At most ``max_concurrency`` requests are in flight; failed requests give None.
+    """
+    config = get_ai_api_config()
+    import openai
+
+    async def _gather():
+        # One client per event loop: async connection pools cannot be shared
+        # across separate asyncio.run() calls.
+        sem = asyncio.Semaphore(max_concurrency)
+        async with openai.AsyncOpenAI(api_key=config["api_key"]) as client:
+            tasks = [acall_ai_api(client, p, max_tokens, sem, json_mode) for p in prompts]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+    responses = []
+    for result in asyncio.run(_gather()):
+        if isinstance(result, Exception):
+            st.warning(f"AI API error: {str(result)}")
+            result = None
+        responses.append(result)
+    return responses
+
+
+def generate_ai_questions_parallel(
+    concept_name: str, difficulty: str, n: int, max_concurrency: int = 10
+) -> List[Dict[str, Any]]:
+    """Generate ``n`` AI-powered practice questions with concurrent API requests.
+
+    Failed or unparsable responses are skipped, so fewer than ``n`` questions
+    may be returned.
+    """
+    prompt = _ai_question_prompt(concept_name, difficulty)
+    questions = []
+    for response in call_ai_api_many([prompt] * n, max_tokens=300, json_mode=True, max_concurrency=max_concurrency):
+        try:
+            q = json.loads(response)
+        except (TypeError, ValueError):
+            continue
+        if q:
+            questions.append(q)
+    return questions
+
+
+def submit_batch_questions(concept_name: str, difficulty: str, n: int) -> str | None:
+    """Queue ``n`` question requests on the OpenAI Batch API.
+
+    Batches cost about half as much as synchronous calls and are not subject to
+    the per-minute rate limit, but may take up to 24 hours. Returns the batch id.
+    """
     config = get_ai_api_config()
-    if not config["enabled"]:
+    prompt = _ai_question_prompt(concept_name, difficulty)
+    lines = [
+        json.dumps({
+            "custom_id": f"question-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": AI_MODEL,
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": 300,
+                "temperature": 0.7,
+                "response_format": _JSON_MODE,
+            },
+        })
+        for i in range(n)
+    ]
+    try:
+        client = _get_client(config["provider"], config["api_key"])
+        batch_file = client.files.create(
+            file=("practice_questions.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+    except Exception as e:
+        st.warning(f"AI API error: {str(e)}")
         return None
-    
+
+
+def collect_batch_questions(batch_id: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """Return the batch status and, once completed, its parsed MC questions."""
+    config = get_ai_api_config()
+    try:
+        client = _get_client(config["provider"], config["api_key"])
+        batch = client.batches.retrieve(batch_id)
+        if batch.status != "completed" or not batch.output_file_id:
+            return batch.status, []
+        output = client.files.content(batch.output_file_id).text
+    except Exception as e:
+        st.warning(f"AI API error: {str(e)}")
+        return "unknown", []
+
+    questions = []
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        body = (json.loads(line).get("response") or {}).get("body") or {}
+        choices = body.get("choices") or []
+        if not choices:
+            continue
+        try:
+            q = json.loads(choices[0]["message"]["content"])
+        except (TypeError, ValueError):
+            continue
+        if q and not _mentions_obj_name(q.get("question", "")):
+            q["type"] = "MC"
+            questions.append(q)
+    return batch.status, questions
+
+
+def _insights_prompt(history: List[Dict], performance_data: Dict) -> str:
     # Prepare summary data
     total_questions = len(history)
     correct = sum(1 for h in history if h.get("correct"))
     accuracy = (correct / total_questions * 100) if total_questions > 0 else 0
     
-    prompt = f"""As an expert learning coach, provide personalized learning insights based on this student data:
+    return f"""As an expert learning coach, provide personalized learning insights based on this student data:
     
     - Total questions attempted: {total_questions}
     - Correct answers: {correct}
@@ -115,16 +421,68 @@ def generate_ai_insights(history: List[Dict], performance_data: Dict) -> str | N
     3. One specific action to take next
     
     Keep response concise (3-4 sentences) and motivating."""
-    
-    return call_ai_api(prompt, max_tokens=200)
+
+
+def generate_ai_insights(history: List[Dict], performance_data: Dict) -> Iterator[str]:
+    """Stream AI-powered learning insights, skipping empty deltas."""
+    stream = stream_ai_api(_insights_prompt(history, performance_data), max_tokens=200)
+    return (chunk for chunk in stream if chunk)
+
+
+# Resolved once per run: without an API key every AI entry point is a no-op,
+# so the UI pays nothing for AI features it cannot use.
+_AI_ENABLED = get_ai_api_config()["enabled"]
+
+if not _AI_ENABLED:
+    def call_ai_api(*args, **kwargs):
+        return None
+
+    def cached_ai_call(*args, **kwargs):
+        return None
+
+    def generate_ai_question(*args, **kwargs):
+        return None
+
+    def call_ai_api_many(prompts, *args, **kwargs):
+        return [None for _ in prompts]
+
+    def generate_ai_questions_parallel(*args, **kwargs):
+        return []
+
+    def submit_batch_questions(*args, **kwargs):
+        return None
+
+    def collect_batch_questions(*args, **kwargs):
+        return "disabled", []
+
+    def call_ai_api_json(*args, **kwargs):
+        return None
+
+    def stream_ai_api(*args, **kwargs):
+        yield from ()
 
 
 # ==================== End AI Configuration ====================
 
 
-@st.cache_resource
-def get_engine() -> OntologyEngine:
-    return OntologyEngine()
+# Ontology lookups keyed by objective IRI; the loaded ontology does not change
+# during a process, so results are shared across reruns and sessions.
+
+# Held as a resource rather than pickled: pickling would resolve every lazy
+# task of the objective, even on pages that only list task names.
+@st.cache_resource(show_spinner=False)
+def _objective_bundle(iri: str) -> Tuple[ObjectiveInfo | None, Sequence[LazyTaskInfo], Sequence[AssessmentInfo]]:
+    return get_engine().bundle_for_objective(iri)
+
+
+@st.cache_resource(show_spinner=False)
+def _objective_label_map() -> Mapping[str, str]:
+    return MappingProxyType({o.iri: o.name for o in get_engine().list_objectives()})
+
+
+@st.cache_data(show_spinner=False)
+def _describe_concepts(iris: Tuple[str, ...]) -> Dict[str, Dict[str, Any]]:
+    return get_engine().describe_concepts(iris)
 
 
 def init_session_state():
@@ -137,34 +495,48 @@ def init_session_state():
     ss.setdefault("history", [])
 
 
+# Question-bank lookups, built once at import
+# Position of each question within its objective's list
+_QID_POS: Dict[str, int] = {
+    qid: i for ids in QUESTIONS_BY_OBJECTIVE.values() for i, qid in enumerate(ids)
+}
+
+# (target, tolerance) for every NUMERIC question
+_NUMERIC_CACHE: Dict[str, Tuple[float, float]] = {
+    qid: (float(q.numeric_answer), float(q.numeric_tolerance or 0.0))
+    for qid, q in QUESTIONS.items()
+    if q.type == "NUMERIC"
+}
+
+
 def questions_for_objective(obj_iri: str) -> List[str]:
-    return [qid for qid, q in QUESTIONS.items() if q["objective_iri"] == obj_iri]
+    return QUESTIONS_BY_OBJECTIVE.get(obj_iri, [])
 
 
 def pick_next_question(obj_iri: str, current_id: str | None) -> str | None:
     ids = questions_for_objective(obj_iri)
     if not ids:
         return None
-    if current_id not in ids:
+    if current_id is None or current_id not in QUESTIONS or QUESTIONS[current_id].objective_iri != obj_iri:
         return ids[0]
-    idx = ids.index(current_id)
+    idx = _QID_POS[current_id]
     return ids[(idx + 1) % len(ids)]
 
 
-def check_answer(q: Dict[str, Any], user_answer: Any) -> bool | None:
-    if q["type"] == "MC":
+def check_answer(q_id: str, user_answer: Any) -> bool | None:
+    q = QUESTIONS[q_id]
+    if q.type == "MC":
         # user_answer is choice id
-        for c in q["mc_choices"]:
-            if c["id"] == user_answer:
-                return c["correct"]
-        return False
-    elif q["type"] == "NUMERIC":
+        try:
+            return bool(q.mc_correct_mask >> q.mc_ids.index(user_answer) & 1)
+        except ValueError:
+            return False
+    elif q.type == "NUMERIC":
         try:
             user_val = float(user_answer)
         except (TypeError, ValueError):
             return False
-        target = float(q["numeric_answer"])
-        tol = float(q.get("numeric_tolerance", 0.0))
+        target, tol = _NUMERIC_CACHE[q_id]
         return abs(user_val - target) <= tol
     else:
         # REFLECTION: we don't auto-mark; return None
@@ -201,6 +573,62 @@ def get_performance_icon(accuracy: float) -> str:
         return "🚀"
 
 
+def _current_streak(correct: np.ndarray) -> int:
+    """Number of consecutive correct answers at the end of ``correct``."""
+    a = np.asarray(correct, dtype=bool)[::-1]
+    return int(a.size if a.all() else np.argmin(a))
+
+
+def suggest_difficulty(evaluated: pd.DataFrame) -> str:
+    """Suggest the next practice difficulty from evaluated attempts."""
+    if len(evaluated) < 5:
+        return "Medium"  # Not enough data, default to Medium
+    acc = evaluated["correct"].mean()
+    avg_hints = evaluated["hints_used"].mean() if "hints_used" in evaluated else 0
+    # If accuracy is high and hints are low, suggest Hard
+    if acc >= 0.85 and avg_hints < 1:
+        return "Hard"
+    # If accuracy is moderate, suggest Medium
+    if acc >= 0.6:
+        return "Medium"
+    # If accuracy is low or hints are high, suggest Easy
+    return "Easy"
+
+
+# Progress charts keyed on their plotted rows, so reruns with unchanged
+# history reuse the figure instead of rebuilding traces and colour scales.
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _accuracy_bar(records: Tuple[Tuple[str, float], ...]) -> go.Figure:
+    import plotly.express as px
+    fig = px.bar(
+        pd.DataFrame(list(records), columns=["objective", "accuracy"]),
+        x="objective",
+        y="accuracy",
+        title="Accuracy by Objective",
+        labels={"accuracy": "Accuracy (%)", "objective": "Objective"},
+        color="accuracy",
+        color_continuous_scale="RdYlGn",
+        range_color=[0, 1]
+    )
+    fig.update_yaxes(tickformat=".0%")
+    return fig
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _attempts_bar(records: Tuple[Tuple[str, int], ...]) -> go.Figure:
+    import plotly.express as px
+    return px.bar(
+        pd.DataFrame(list(records), columns=["concept", "attempts"]),
+        x="concept",
+        y="attempts",
+        title="Practice Attempts by Concept",
+        labels={"attempts": "Number of Attempts", "concept": "Concept"},
+        color="attempts",
+        color_continuous_scale="Blues"
+    )
+
+
 def create_progress_ring(value: float, max_value: float = 100) -> str:
     """Create an HTML progress ring visualization"""
     percentage = (value / max_value) * 100
@@ -222,12 +650,26 @@ def create_progress_ring(value: float, max_value: float = 100) -> str:
     """
 
 
+@st.cache_resource(show_spinner=False)
+def _image_files(directory: str) -> frozenset:
+    """Names of the files in an image directory, listed once per process."""
+    return frozenset(os.listdir(directory)) if os.path.isdir(directory) else frozenset()
+
+
+@st.cache_resource(show_spinner=False)
+def _load_pil(path: str) -> Image.Image:
+    """Open and decode an image once; later reruns reuse the decoded copy."""
+    from PIL import Image
+    with Image.open(path) as img:
+        return img.copy()
+
+
 def display_concept_image(concept_name: str, width: int = 600):
     """Display a concept image if it exists"""
-    image_path = f"images/concepts/{concept_name}.png"
-    if os.path.exists(image_path):
+    filename = f"{concept_name}.png"
+    if filename in _image_files("images/concepts"):
         try:
-            img = Image.open(image_path)
+            img = _load_pil(f"images/concepts/{filename}")
             st.image(img, use_column_width=True, caption=f"{concept_name} Illustration")
             return True
         except Exception as e:
@@ -238,12 +680,12 @@ def display_concept_image(concept_name: str, width: int = 600):
 
 def display_task_image(task_name: str):
     """Display a task-related image if it exists"""
+    available = _image_files("images/tasks")
     # Try different naming conventions
     for filename in [f"{task_name}.png", f"{task_name.lower()}.png", f"{task_name.replace(' ', '_')}.png"]:
-        image_path = f"images/tasks/{filename}"
-        if os.path.exists(image_path):
+        if filename in available:
             try:
-                img = Image.open(image_path)
+                img = _load_pil(f"images/tasks/{filename}")
                 st.image(img, use_column_width=True, caption=f"{task_name}")
                 return True
             except Exception as e:
@@ -274,9 +716,179 @@ def display_mastery_badge(mastery_level: float) -> str:
 
 def clean_objective_name(name: str) -> str:
     """Remove technical prefixes like 'Obj...' and return a clean concept name"""
-    if re.match(r'Obj[A-Z][a-zA-Z0-9]+', name):
-        return "Graph Neural Networks"
-    return name
+    return "Graph Neural Networks" if name.startswith("Obj") and _OBJ_RE.match(name) else name
+
+
+# ==================== Page Styling ====================
+# Static style blocks, defined once at import and injected on every run
+# (Streamlit drops elements that a rerun does not emit again).
+
+_BASE_CSS = """
+    <style>
+    :root {
+        --primary-color: #ff9800;
+        --secondary-color: #fff;
+        --success-color: #ff9800;
+        --warning-color: #ff9800;
+        --error-color: #ef4444;
+    }
+    body, .main {
+        background: linear-gradient(135deg, #fff 0%, #ffe0b2 100%);
+    }
+    button {
+        border-radius: 8px !important;
+        font-weight: 600 !important;
+        background: #ff9800 !important;
+        color: #fff !important;
+        transition: all 0.3s ease !important;
+    }
+    .stMetric {
+        background: #fff;
+        padding: 20px;
+        border-radius: 10px;
+        box-shadow: 0 2px 8px rgba(255,152,0,0.15);
+    }
+    .stMetricValue {
+        color: #ff9800 !important;
+        font-size: 32px !important;
+        font-weight: 700 !important;
+    }
+    h1, h2, h3 {
+        color: #ff9800 !important;
+        font-weight: 700 !important;
+        margin-top: 20px !important;
+        margin-bottom: 15px !important;
+    }
+    h1 {
+        background: linear-gradient(135deg, #ff9800 0%, #fff3e0 100%);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        background-clip: text;
+        margin-bottom: 30px !important;
+    }
+    .stTabs [data-baseweb="tab-list"] {
+        gap: 15px;
+    }
+    .stTabs [data-baseweb="tab"] {
+        padding: 12px 24px !important;
+        border-radius: 8px !important;
+        border: none !important;
+        background: rgba(255,255,255,0.8);
+        font-weight: 600;
+        color: #000 !important;
+    }
+    .stTabs [aria-selected="true"] {
+        background: linear-gradient(135deg, #ff9800 0%, #fff3e0 100%) !important;
+        color: #000 !important;
+    }
+    .streamlit-expanderHeader {
+        background-color: #fff3e0 !important;
+        border-radius: 8px !important;
+    }
+    .stSuccess {
+        background: rgba(255,152,0,0.08) !important;
+        border-left: 4px solid #ff9800 !important;
+        border-radius: 8px !important;
+    }
+    .stError {
+        background: rgba(239, 68, 68, 0.1) !important;
+        border-left: 4px solid #ef4444 !important;
+        border-radius: 8px !important;
+    }
+    .stWarning {
+        background: rgba(255,152,0,0.08) !important;
+        border-left: 4px solid #ff9800 !important;
+        border-radius: 8px !important;
+    }
+    .stInfo {
+        background: rgba(255,152,0,0.08) !important;
+        border-left: 4px solid #ff9800 !important;
+        border-radius: 8px !important;
+    }
+    .stSelectbox, .stTextInput, .stNumberInput {
+        border-radius: 8px !important;
+        border: 2px solid #ff9800 !important;
+    }
+    .stRadio > label {
+        background: #fff;
+        padding: 12px 16px;
+        border-radius: 8px;
+        margin-bottom: 10px;
+        border: 2px solid #ffe0b2;
+        transition: all 0.3s ease;
+    }
+    .stRadio > label:hover {
+        border-color: #ff9800;
+        background: #fff3e0;
+    }
+    .stDataFrame {
+        border-radius: 8px !important;
+    }
+    hr {
+        margin: 30px 0 !important;
+        border: none !important;
+        height: 2px;
+        background: linear-gradient(90deg, transparent, #ffe0b2, transparent);
+    }
+    </style>
+"""
+
+_COMPONENT_CSS = """
+    <style>
+    .golden-rule-tip {
+        background: #fff3e0;
+        border-left: 4px solid #ff9800;
+        border-radius: 8px;
+        padding: 12px;
+        margin-bottom: 10px;
+        font-size: 0.98em;
+    }
+    .sticky-header {
+        position: sticky;
+        top: 0;
+        z-index: 100;
+        background: linear-gradient(90deg, #ff9800 0%, #fff3e0 100%);
+        color: #fff;
+        padding: 16px 0 8px 0;
+        font-size: 2em;
+        text-align: center;
+        box-shadow: 0 2px 8px rgba(255,152,0,0.15);
+    }
+    .animated-btn {
+        transition: box-shadow 0.2s, transform 0.2s;
+    }
+    .animated-btn:hover {
+        box-shadow: 0 4px 16px rgba(255,152,0,0.25);
+        transform: scale(1.04);
+    }
+    .ontology-panel {
+        background: #fff;
+        border-radius: 12px;
+        box-shadow: 0 2px 12px rgba(51,102,255,0.08);
+        padding: 18px;
+        margin-bottom: 18px;
+    }
+    .search-bar {
+        border-radius: 8px;
+        border: 2px solid #ff9800;
+        padding: 8px 12px;
+        font-size: 1em;
+        width: 100%;
+        margin-bottom: 10px;
+    }
+    .progress-indicator {
+        background: linear-gradient(90deg, #ff9800 0%, #fff3e0 100%);
+        color: #fff;
+        border-radius: 8px;
+        padding: 8px 16px;
+        font-weight: 600;
+        margin-bottom: 10px;
+        text-align: center;
+    }
+    </style>
+"""
+
+_STICKY_HEADER = "<div class='sticky-header'>GNN Intelligent Tutoring System</div>"
 
 
 def main():
@@ -293,118 +905,12 @@ def main():
     
     # Custom styling
 
-    st.markdown("""
-        <style>
-        :root {
-            --primary-color: #ff9800;
-            --secondary-color: #fff;
-            --success-color: #ff9800;
-            --warning-color: #ff9800;
-            --error-color: #ef4444;
-        }
-        body, .main {
-            background: linear-gradient(135deg, #fff 0%, #ffe0b2 100%);
-        }
-        button {
-            border-radius: 8px !important;
-            font-weight: 600 !important;
-            background: #ff9800 !important;
-            color: #fff !important;
-            transition: all 0.3s ease !important;
-        }
-        .stMetric {
-            background: #fff;
-            padding: 20px;
-            border-radius: 10px;
-            box-shadow: 0 2px 8px rgba(255,152,0,0.15);
-        }
-        .stMetricValue {
-            color: #ff9800 !important;
-            font-size: 32px !important;
-            font-weight: 700 !important;
-        }
-        h1, h2, h3 {
-            color: #ff9800 !important;
-            font-weight: 700 !important;
-            margin-top: 20px !important;
-            margin-bottom: 15px !important;
-        }
-        h1 {
-            background: linear-gradient(135deg, #ff9800 0%, #fff3e0 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-            margin-bottom: 30px !important;
-        }
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 15px;
-        }
-        .stTabs [data-baseweb="tab"] {
-            padding: 12px 24px !important;
-            border-radius: 8px !important;
-            border: none !important;
-            background: rgba(255,255,255,0.8);
-            font-weight: 600;
-            color: #000 !important;
-        }
-        .stTabs [aria-selected="true"] {
-            background: linear-gradient(135deg, #ff9800 0%, #fff3e0 100%) !important;
-            color: #000 !important;
-        }
-        .streamlit-expanderHeader {
-            background-color: #fff3e0 !important;
-            border-radius: 8px !important;
-        }
-        .stSuccess {
-            background: rgba(255,152,0,0.08) !important;
-            border-left: 4px solid #ff9800 !important;
-            border-radius: 8px !important;
-        }
-        .stError {
-            background: rgba(239, 68, 68, 0.1) !important;
-            border-left: 4px solid #ef4444 !important;
-            border-radius: 8px !important;
-        }
-        .stWarning {
-            background: rgba(255,152,0,0.08) !important;
-            border-left: 4px solid #ff9800 !important;
-            border-radius: 8px !important;
-        }
-        .stInfo {
-            background: rgba(255,152,0,0.08) !important;
-            border-left: 4px solid #ff9800 !important;
-            border-radius: 8px !important;
-        }
-        .stSelectbox, .stTextInput, .stNumberInput {
-            border-radius: 8px !important;
-            border: 2px solid #ff9800 !important;
-        }
-        .stRadio > label {
-            background: #fff;
-            padding: 12px 16px;
-            border-radius: 8px;
-            margin-bottom: 10px;
-            border: 2px solid #ffe0b2;
-            transition: all 0.3s ease;
-        }
-        .stRadio > label:hover {
-            border-color: #ff9800;
-            background: #fff3e0;
-        }
-        .stDataFrame {
-            border-radius: 8px !important;
-        }
-        hr {
-            margin: 30px 0 !important;
-            border: none !important;
-            height: 2px;
-            background: linear-gradient(90deg, transparent, #ffe0b2, transparent);
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_BASE_CSS, unsafe_allow_html=True)
     
     init_session_state()
     engine = get_engine()
+    if _AI_ENABLED:
+        _prewarm_ai_connection()
     O, G = engine.O, engine.G  # not currently used directly, but handy if you expand
 
     # Display main banner
@@ -426,61 +932,8 @@ def main():
 
     tab_labels = ["📚 Overview", "📖 Learn", "✍️ Practice", "📊 Progress", "💡 Insights"]
     tab_overview, tab_learn, tab_practice, tab_progress, tab_insights = st.tabs(tab_labels)
-    st.markdown("""
-        <style>
-        .golden-rule-tip {
-            background: #fff3e0;
-            border-left: 4px solid #ff9800;
-            border-radius: 8px;
-            padding: 12px;
-            margin-bottom: 10px;
-            font-size: 0.98em;
-        }
-        .sticky-header {
-            position: sticky;
-            top: 0;
-            z-index: 100;
-            background: linear-gradient(90deg, #ff9800 0%, #fff3e0 100%);
-            color: #fff;
-            padding: 16px 0 8px 0;
-            font-size: 2em;
-            text-align: center;
-            box-shadow: 0 2px 8px rgba(255,152,0,0.15);
-        }
-        .animated-btn {
-            transition: box-shadow 0.2s, transform 0.2s;
-        }
-        .animated-btn:hover {
-            box-shadow: 0 4px 16px rgba(255,152,0,0.25);
-            transform: scale(1.04);
-        }
-        .ontology-panel {
-            background: #fff;
-            border-radius: 12px;
-            box-shadow: 0 2px 12px rgba(51,102,255,0.08);
-            padding: 18px;
-            margin-bottom: 18px;
-        }
-        .search-bar {
-            border-radius: 8px;
-            border: 2px solid #ff9800;
-            padding: 8px 12px;
-            font-size: 1em;
-            width: 100%;
-            margin-bottom: 10px;
-        }
-        .progress-indicator {
-            background: linear-gradient(90deg, #ff9800 0%, #fff3e0 100%);
-            color: #fff;
-            border-radius: 8px;
-            padding: 8px 16px;
-            font-weight: 600;
-            margin-bottom: 10px;
-            text-align: center;
-        }
-        </style>
-    """, unsafe_allow_html=True)
-    st.markdown("<div class='sticky-header'>GNN Intelligent Tutoring System</div>", unsafe_allow_html=True)
+    st.markdown(_COMPONENT_CSS, unsafe_allow_html=True)
+    st.markdown(_STICKY_HEADER, unsafe_allow_html=True)
 
     # ---------- OVERVIEW TAB ----------
     with tab_overview:
@@ -496,13 +949,9 @@ def main():
         else:
             names = [o.name for o in objectives]
             iri_by_name = {o.name: o.iri for o in objectives}
+            name_by_iri = {o.iri: o.name for o in objectives}
 
-            current_name = None
-            if st.session_state.current_objective_iri:
-                for o in objectives:
-                    if o.iri == st.session_state.current_objective_iri:
-                        current_name = o.name
-                        break
+            current_name = name_by_iri.get(st.session_state.current_objective_iri)
 
             # Always show all objectives in dropdown
 
@@ -524,8 +973,8 @@ def main():
                 )
 
             selected_iri = iri_by_name[choice]
-            selected_obj = engine.get_objective_by_iri(selected_iri)
-            info = engine.objective_info(selected_obj)
+            # The task tuple is shared from the engine's index, so skipping it is free
+            info, _, assessments = _objective_bundle(selected_iri)
 
             col1, col2 = st.columns([2, 1])
             with col1:
@@ -547,7 +996,6 @@ def main():
             st.markdown("### 📋 Related assessments in the ontology")
             #st.markdown("<div class='golden-rule-tip'>Get feedback on your progress and requirements.</div>", unsafe_allow_html=True)
 
-            assessments = engine.assessments_for_objective(selected_obj)
             if not assessments:
                 st.info("ℹ️ No explicit Assessment individuals linked to this objective.")
             else:
@@ -577,8 +1025,9 @@ def main():
                         if a.required_concepts:
                             st.markdown("**🔗 Requires concepts:**")
                             cols = st.columns(min(3, len(a.required_concepts)))
+                            required = _describe_concepts(tuple(a.required_concepts))
                             for idx, c_iri in enumerate(a.required_concepts):
-                                c = engine.describe_concept(c_iri)
+                                c = required[c_iri]
                                 with cols[idx % len(cols)]:
                                     st.caption(f"• {c['name']} ({c['kind']})")
                         st.divider()
@@ -596,24 +1045,20 @@ def main():
         if not obj_iri:
             st.info("👈 Choose an objective in the **Overview** tab first.")
         else:
-            obj = engine.get_objective_by_iri(obj_iri)
-            tasks = engine.tasks_for_objective(obj)
+            _, tasks, _ = _objective_bundle(obj_iri)
 
             if not tasks:
                 st.warning("⚠️ No LearningTask instances linked to this objective.")
             else:
                 task_names = [t.name for t in tasks]
                 iri_by_name = {t.name: t.iri for t in tasks}
+                task_by_iri = {t.iri: t for t in tasks}
 
                 search_task = st.text_input("🔍 Search tasks:", "", key="task_search", help="Type to filter tasks.", args={"class": "search-bar"})
                 filtered_task_names = [n for n in task_names if search_task.lower() in n.lower()] if search_task else task_names
 
-                current_task_name = None
-                if st.session_state.current_task_iri:
-                    for t in tasks:
-                        if t.iri == st.session_state.current_task_iri:
-                            current_task_name = t.name
-                            break
+                current_task = task_by_iri.get(st.session_state.current_task_iri)
+                current_task_name = current_task.name if current_task else None
 
                 selected_task_name = st.selectbox(
                     "Available tasks:",
@@ -624,7 +1069,7 @@ def main():
                 t_iri = iri_by_name[selected_task_name]
                 st.session_state.current_task_iri = t_iri
 
-                selected_task_info = next(t for t in tasks if t.iri == t_iri)
+                selected_task_info = task_by_iri[t_iri]
 
                 st.markdown(f"#### {selected_task_info.name}")
                 if selected_task_info.description:
@@ -641,18 +1086,25 @@ def main():
 
                 st.divider()
 
+                # Describe every linked concept, dataset and graph in one call
+                described = _describe_concepts(tuple(
+                    selected_task_info.concept_iris
+                    + selected_task_info.dataset_iris
+                    + selected_task_info.graph_iris
+                ))
+
                 if selected_task_info.concept_iris:
                     st.markdown("##### 🔗 Linked GNN concepts")
                     concept_cols = st.columns(min(3, len(selected_task_info.concept_iris)))
                     for idx, c_iri in enumerate(selected_task_info.concept_iris):
-                        c_info = engine.describe_concept(c_iri)
+                        c_info = described[c_iri]
                         with concept_cols[idx % len(concept_cols)]:
                             st.info(f"**{c_info['name']}** ({c_info['kind']})")
 
                 if selected_task_info.dataset_iris:
                     st.markdown("##### 📊 Graph datasets used")
                     for d_iri in selected_task_info.dataset_iris:
-                        d = engine.describe_concept(d_iri)
+                        d = described[d_iri]
                         details = d["details"]
                         extra = []
                         if details.get("datasetName"):
@@ -667,7 +1119,7 @@ def main():
                 if selected_task_info.graph_iris:
                     st.markdown("##### 🕸️ Example graph instances")
                     for g_iri in selected_task_info.graph_iris:
-                        g = engine.describe_concept(g_iri)
+                        g = described[g_iri]
                         details = g["details"]
                         nodes = details.get('numNodes', '?')
                         edges = details.get('numEdges', '?')
@@ -687,6 +1139,8 @@ def main():
         obj_iri = st.session_state.current_objective_iri
         if not obj_iri:
             st.info("👈 Choose an objective in the **Overview** tab first.")
+        elif not _AI_ENABLED:
+            st.info("🔑 AI practice questions need an API key. Add `OPENAI_API_KEY` to your `.env` file to enable them.")
         else:
             st.markdown("#### Practice: AI-Generated Questions (Progressive)")
             st.markdown("**How many questions do you want to practice?**")
@@ -715,6 +1169,8 @@ def main():
             ss.setdefault("practice_answers", [])
             ss.setdefault("practice_started", False)
             ss.setdefault("practice_complete", False)
+            ss.setdefault("practice_batch_id", None)
+            ss.setdefault("practice_questions_pending", [])
 
             import random
             def generate_practice_questions(concept, difficulty, n):
@@ -725,68 +1181,109 @@ def main():
                     obj = engine.get_objective_by_iri(obj_iri)
                     obj_name = getattr(obj, "name", None)
                 # Clean up topic for plausibility
-                import re
                 def plausible_topic(name):
                     # Remove technical or code-like names
-                    if re.match(r'Obj[A-Z][a-zA-Z0-9]+', name):
+                    if name.startswith("Obj") and _OBJ_RE.match(name):
                         return "Graph Convolutional Network Training"
                     return name
                 topic = plausible_topic(obj_name) if obj_name else concept
-                questions = []
-                prompt = (
-                    f"Generate {n} unique and diverse questions (mix of MC and Theory) covering all key concepts, applications, challenges, and recent advances in the topic: '{topic}'. "
-                    f"Questions must be plausible, clear, and suitable for a human learner. Avoid technical names like 'ObjTrainGCNModel' and use conceptual language. Each question should be different and not repeated. Format: For MC, provide question, 4 options, and correct index. For Theory, provide question only. Difficulty: {difficulty}."
-                )
-                ai_response = call_ai_api(prompt, max_tokens=1200)
-                q_blocks = re.split(r'\n\d+\. ', '\n' + ai_response)
-                for block in q_blocks:
-                    block = block.strip()
-                    if not block:
-                        continue
-                    # Filter out implausible questions
-                    if re.search(r'Obj[A-Z][a-zA-Z0-9]+', block):
-                        continue
-                    if 'Options:' in block:
-                        q_match = re.match(r'(.*)Options:(.*)Correct Index:(\d+)', block, re.DOTALL)
-                        if q_match:
-                            q_text = q_match.group(1).strip()
-                            # Remove any "Correct:" information from question text
-                            q_text = re.sub(r'\nCorrect[:\-].*', '', q_text, flags=re.IGNORECASE | re.DOTALL)
-                            opts = [o.strip() for o in q_match.group(2).split('\n') if o.strip()]
-                            # Remove any "Correct:" labels from options
-                            opts = [re.sub(r'Correct[:\-].*', '', o, flags=re.IGNORECASE).strip() for o in opts if o.strip()]
-                            correct_idx = int(q_match.group(3).strip())
-                            questions.append({
+                def parse_question_blocks(text):
+                    parsed = []
+                    q_blocks = _QBLOCK_SPLIT_RE.split('\n' + (text or ""))
+                    for block in q_blocks:
+                        block = block.strip()
+                        if not block:
+                            continue
+                        # Filter out implausible questions
+                        if _mentions_obj_name(block):
+                            continue
+                        i_opts = block.find('Options:')
+                        if i_opts >= 0:
+                            # Single scan: slice question, options and index around the markers
+                            i_ci = block.find('Correct Index:', i_opts)
+                            if i_ci < 0:
+                                continue
+                            idx_text = block[i_ci + 14:].split(None, 1)
+                            if not idx_text or not idx_text[0].isdigit():
+                                continue
+                            # Remove any "Correct:" information from question text and options
+                            q_text = _CORRECT_STRIP_RE.sub('', block[:i_opts]).strip()
+                            opts = [
+                                _CORRECT_OPT_RE.sub('', o).strip()
+                                for o in block[i_opts + 8:i_ci].splitlines() if o.strip()
+                            ]
+                            parsed.append({
                                 "question": q_text,
                                 "options": opts,
-                                "correct_idx": correct_idx,
+                                "correct_idx": int(idx_text[0]),
                                 "type": "MC"
                             })
+                        else:
+                            # Split off the model answer, then remove any "Correct:" information
+                            q_part, _, ref_answer = block.partition('RefAnswer:')
+                            block_clean = _CORRECT_STRIP_RE.sub('', q_part).strip()
+                            if block_clean:
+                                parsed.append({
+                                    "question": block_clean,
+                                    "type": "THEORY",
+                                    "ref_answer": ref_answer.strip()
+                                })
+                    return parsed
+
+                question_format = "Format: For MC, provide question, 4 options, and correct index. For Theory, provide the question followed by a 'RefAnswer:' line with a brief model answer."
+                prompt = (
+                    f"Generate {n} unique and diverse questions (mix of MC and Theory) covering all key concepts, applications, challenges, and recent advances in the topic: '{topic}'. "
+                    f"Questions must be plausible, clear, and suitable for a human learner. Avoid technical names like 'ObjTrainGCNModel' and use conceptual language. Each question should be different and not repeated. {question_format} Difficulty: {difficulty}."
+                )
+                # Stream the bulk request and parse each numbered block as soon as
+                # the next one starts, so the reply can be cut off at n questions
+                questions = []
+                progress = st.progress(0.0, text="Generating questions...")
+                buffer = "\n"
+                with contextlib.closing(stream_ai_api(prompt, max_tokens=1600)) as stream:
+                    for chunk in stream:
+                        buffer += chunk
+                        *complete, buffer = _QBLOCK_SPLIT_RE.split(buffer)
+                        for block in complete:
+                            questions += parse_question_blocks(block)
+                        if complete:
+                            progress.progress(min(len(questions) / n, 1.0), text=f"Generated {len(questions)} of {n} questions")
+                        if len(questions) >= n:
+                            break
                     else:
-                        # Remove any "Correct:" information from theory questions
-                        block_clean = re.sub(r'\nCorrect[:\-].*', '', block, flags=re.IGNORECASE | re.DOTALL).strip()
-                        if block_clean:
-                            questions.append({
-                                "question": block_clean,
-                                "type": "THEORY"
-                            })
-                if len(questions) < n:
-                    for i in range(n - len(questions)):
-                        qtype = "MC" if i % 2 == 0 else "THEORY"
-                        sub_prompt = (
-                            f"Generate a {qtype} question about the topic '{topic}' at {difficulty} difficulty. Make it unique, plausible, and not repeated. Use conceptual language, not technical names."
-                        )
-                        q = generate_ai_question(sub_prompt, difficulty.lower())
-                        if qtype == "THEORY":
+                        questions += parse_question_blocks(buffer)
+                progress.empty()
+                missing = n - len(questions)
+                while missing > 0:
+                    # Ask for the missing questions in as few follow-up requests
+                    # as the completion-token limit allows
+                    batch = min(missing, _MAX_COMPLETION_TOKENS // 150)
+                    asked = [q["question"] for q in questions]
+                    extra = parse_question_blocks(
+                        generate_ai_questions_batch(topic, difficulty, batch, asked, question_format)
+                    )
+                    questions += extra
+                    missing = n - len(questions)
+                    if len(extra) < batch:
+                        # Under-delivered: leave the rest to the parallel fallback
+                        # rather than asking again one batch at a time
+                        break
+                if missing > 0:
+                    # Last resort: concurrent one-question requests
+                    extra = generate_ai_questions_parallel(topic, difficulty.lower(), missing)
+                    for i, q in enumerate(extra):
+                        if not q:
+                            continue
+                        # Filter again
+                        if _mentions_obj_name(q.get('question', '')):
+                            continue
+                        if i % 2 == 1:
                             q = {
                                 "question": f"(Theory) {q.get('question', 'Describe the concept: ' + topic)}",
                                 "type": "THEORY"
                             }
                         else:
                             q["type"] = "MC"
-                        # Filter again
-                        if re.search(r'Obj[A-Z][a-zA-Z0-9]+', q.get('question', '')):
-                            continue
                         questions.append(q)
                 return questions[:n]
 
@@ -795,10 +1292,40 @@ def main():
                     with st.spinner(f"Generating {num_questions} questions on {concept}..."):
                         ss["practice_questions"] = generate_practice_questions(concept, difficulty, num_questions)
                         ss["practice_current_idx"] = 0
-                        ss["practice_answers"] = []
+                        # One slot per question, filled in place as answers are submitted
+                        ss["practice_answers"] = [None] * len(ss["practice_questions"])
                         ss["practice_started"] = True
                         ss["practice_complete"] = False
                         st.success("✅ Practice session started! ")
+
+                # Larger decks can be queued on the Batch API: cheaper, but ready within 24 hours
+                st.markdown("**Or queue a larger deck for later** (cheaper, ready within 24 hours)")
+                if ss["practice_batch_id"]:
+                    if st.button("Check queued questions", key="check_batch_btn"):
+                        status, queued = collect_batch_questions(ss["practice_batch_id"])
+                        if status == "completed":
+                            ss["practice_questions_pending"] = queued
+                            ss["practice_batch_id"] = None
+                        elif status in ("failed", "expired", "cancelled"):
+                            st.warning(f"Queued questions {status}. Please queue them again.")
+                            ss["practice_batch_id"] = None
+                        else:
+                            st.info(f"Queued questions are not ready yet (status: {status.replace('_', ' ')}).")
+                elif st.button("Queue 50 questions overnight", key="queue_batch_btn"):
+                    batch_id = submit_batch_questions(concept, difficulty.lower(), 50)
+                    if batch_id:
+                        ss["practice_batch_id"] = batch_id
+                        st.success("✅ Questions queued! Check back later to start practising with them.")
+                pending = ss["practice_questions_pending"]
+                if pending:
+                    if st.button(f"Start session with {len(pending)} queued questions", key="start_pending_btn"):
+                        ss["practice_questions"] = pending
+                        ss["practice_questions_pending"] = []
+                        ss["practice_current_idx"] = 0
+                        ss["practice_answers"] = [None] * len(pending)
+                        ss["practice_started"] = True
+                        ss["practice_complete"] = False
+                        st.rerun()
             else:
                 questions = ss["practice_questions"]
                 idx = ss["practice_current_idx"]
@@ -807,6 +1334,48 @@ def main():
 
                 st.markdown(f"<div class='progress-indicator'>Question {idx+1} of {total}</div>", unsafe_allow_html=True)
 
+                # Submit handlers run as button callbacks, before the rerun the
+                # click triggers, so that rerun already shows the next question.
+                def submit_mc_answer(idx, q, options):
+                    user_choice = ss.get(f"practice_choice_{idx}")
+                    chosen_idx = int(user_choice.split(":")[0]) - 1 if user_choice else None
+                    correct = (chosen_idx == q.get('correct_idx', -1))
+                    ss["practice_answers"][idx] = {"type": "MC", "correct": correct, "user_choice": chosen_idx, "question": q.get('question', ''), "options": options}
+                    ss["practice_current_idx"] += 1
+                    st.toast("Answer submitted! ")
+
+                def submit_theory_answer(idx, q):
+                    user_answer = ss.get(f"practice_theory_{idx}", "")
+                    # Use OpenAI to check similarity and assign 1 mark if close
+                    ref_answer = q.get("ref_answer")
+                    if ref_answer:
+                        sim_prompt = (
+                            f"Compare the following student answer to the reference answer. If the student answer is close in meaning, assign 1 mark. Otherwise, assign 0.\n"
+                            f"Reference: {ref_answer}\nStudent: {user_answer}\nOutput: Mark (0 or 1) and brief feedback."
+                        )
+                        assessment = cached_ai_call(sim_prompt, max_tokens=60)
+                    else:
+                        # No model answer came with the question: write one and
+                        # mark against it in the same request
+                        sim_prompt = (
+                            f"Question: {q.get('question', '')}\n"
+                            f"First provide a brief model answer. Then compare the following student answer to your model answer. If the student answer is close in meaning, assign 1 mark. Otherwise, assign 0.\n"
+                            f"Student: {user_answer}\nOutput: Model answer, then Mark (0 or 1) and brief feedback."
+                        )
+                        assessment = cached_ai_call(sim_prompt, max_tokens=160)
+                    # Parse mark from assessment
+                    mark_match = _MARK_RE.search(assessment or "")
+                    mark = int(mark_match.group(1)) if mark_match else 0
+                    ss["practice_answers"][idx] = {
+                        "type": "THEORY",
+                        "user_answer": user_answer,
+                        "assessment": assessment,
+                        "question": q.get('question', ''),
+                        "mark": mark
+                    }
+                    ss["practice_current_idx"] += 1
+                    st.toast("Answer submitted! ")
+
                 if idx < total:
                     q = questions[idx]
                     st.markdown(f"**Question {idx+1} of {total}:** {q.get('question', 'N/A')}")
@@ -814,74 +1383,48 @@ def main():
                     if q.get("type") == "MC":
                         options = q.get('options', [])
                         if options:
-                            user_choice = st.radio("Select an answer:", [f"{i+1}: {opt}" for i, opt in enumerate(options)], key=f"practice_choice_{idx}", help="Choose your answer.")
-                            chosen_idx = int(user_choice.split(":")[0]) - 1 if user_choice else None
-                            if st.button("Submit Answer", key=f"practice_submit_{idx}", args={"class": "animated-btn"}):
-                                correct = (chosen_idx == q.get('correct_idx', -1))
-                                answers.append({"type": "MC", "correct": correct, "user_choice": chosen_idx, "question": q.get('question', ''), "options": options})
-                                ss["practice_answers"] = answers
-                                ss["practice_current_idx"] += 1
-                                st.success("Answer submitted! ")
-                                st.rerun()
+                            st.radio("Select an answer:", [f"{i+1}: {opt}" for i, opt in enumerate(options)], key=f"practice_choice_{idx}", help="Choose your answer.")
+                            st.button("Submit Answer", key=f"practice_submit_{idx}", on_click=submit_mc_answer, args=(idx, q, options))
                     elif q.get("type") == "THEORY":
-                        user_answer = st.text_area("Your answer:", key=f"practice_theory_{idx}", help="Type your answer.")
-                        if st.button("Submit Answer", key=f"practice_submit_{idx}", args={"class": "animated-btn"}):
-                            # Use OpenAI to check similarity and assign 1 mark if close
-                            ref_answer_prompt = f"Provide a model answer for: {q.get('question', '')}"
-                            ref_answer = call_ai_api(ref_answer_prompt, max_tokens=80)
-                            sim_prompt = (
-                                f"Compare the following student answer to the reference answer. If the student answer is close in meaning, assign 1 mark. Otherwise, assign 0.\n"
-                                f"Reference: {ref_answer}\nStudent: {user_answer}\nOutput: Mark (0 or 1) and brief feedback."
-                            )
-                            assessment = call_ai_api(sim_prompt, max_tokens=60)
-                            # Parse mark from assessment
-                            import re
-                            mark_match = re.search(r'Mark\s*[:\-]?\s*(\d)', assessment)
-                            mark = int(mark_match.group(1)) if mark_match else 0
-                            answers.append({
-                                "type": "THEORY",
-                                "user_answer": user_answer,
-                                "assessment": assessment,
-                                "question": q.get('question', ''),
-                                "mark": mark
-                            })
-                            ss["practice_answers"] = answers
-                            ss["practice_current_idx"] += 1
-                            st.success("Answer submitted! ")
-                            st.rerun()
+                        st.text_area("Your answer:", key=f"practice_theory_{idx}", help="Type your answer.")
+                        st.button("Submit Answer", key=f"practice_submit_{idx}", on_click=submit_theory_answer, args=(idx, q))
                 else:
                     ss["practice_complete"] = True
                     st.success("🎉 Practice session complete! ")
                     st.markdown("### Results Summary")
-                    mc_results = [a for a in answers if a["type"] == "MC"]
-                    theory_results = [a for a in answers if a["type"] == "THEORY"]
-                    if mc_results:
-                        correct_count = sum(1 for a in mc_results if a["correct"])
-                        st.write(f"**MC Questions:** {correct_count}/{len(mc_results)} correct")
-                    if theory_results:
-                        total_marks = sum(a.get("mark", 0) for a in theory_results)
-                        st.write(f"**Theory Questions:** {total_marks}/{len(theory_results)} marks")
-                        for i, a in enumerate(theory_results, 1):
-                            st.markdown(f"**Q{i}:** {a['question']}")
-                            st.markdown(f"Your answer: {a['user_answer']}")
-                            st.markdown(f"Assessment: {a['assessment']}")
+                    ans_df = pd.DataFrame(answers, columns=["type", "correct", "mark", "question", "user_answer", "assessment"])
+                    by_type = ans_df.groupby("type")
+                    if "MC" in by_type.groups:
+                        mc_df = by_type.get_group("MC")
+                        st.write(f"**MC Questions:** {int(mc_df['correct'].sum())}/{len(mc_df)} correct")
+                    if "THEORY" in by_type.groups:
+                        theory_df = by_type.get_group("THEORY")
+                        total_marks = int(theory_df["mark"].fillna(0).sum())
+                        st.write(f"**Theory Questions:** {total_marks}/{len(theory_df)} marks")
+                        for i, a in enumerate(theory_df.itertuples(index=False), 1):
+                            st.markdown(f"**Q{i}:** {a.question}")
+                            st.markdown(f"Your answer: {a.user_answer}")
+                            st.markdown(f"Assessment: {a.assessment}")
                     # Save results to session history for analytics
                     if "history" not in st.session_state:
                         st.session_state["history"] = []
-                    for a in answers:
-                        entry = {
+                    objective_iri = st.session_state.get("current_objective_iri", "")
+                    now_ts = pd.Timestamp.now()
+                    st.session_state["history"].extend([
+                        {
                             "question": a.get("question", ""),
                             "type": a.get("type", ""),
                             "correct": a.get("correct", a.get("mark", 0)),
                             "user_answer": a.get("user_answer", ""),
                             "options": a.get("options", []),
                             "evaluated": True,
-                            "timestamp": pd.Timestamp.now(),
-                            "concept_iri": st.session_state.get("current_objective_iri", ""),
-                            "objective_iri": st.session_state.get("current_objective_iri", ""),
+                            "timestamp": now_ts,
+                            "concept_iri": objective_iri,
+                            "objective_iri": objective_iri,
                             "question_type": a.get("type", "")
                         }
-                        st.session_state["history"].append(entry)
+                        for a in answers
+                    ])
                     st.markdown("<div class='golden-rule-tip'>You can restart your session below. </div>", unsafe_allow_html=True)
                     if st.button("Restart Practice Session", key="restart_practice_btn", args={"class": "animated-btn"}):
                         ss["practice_questions"] = []
@@ -893,6 +1436,19 @@ def main():
                         st.rerun()
         st.markdown("</div>", unsafe_allow_html=True)
 
+    # History views shared by Progress and Insights, built once per rerun
+    # after Practice has recorded any newly completed session.
+    df = pd.DataFrame(st.session_state.history)
+    # Every practice answer is recorded as evaluated, so skip the masked copy
+    # unless some rows really are filtered out
+    evaluated = df if df.empty or df["evaluated"].all() else df.loc[df["evaluated"]]
+    study_days = df["timestamp"].dt.date.nunique() if not df.empty else 0
+    # Correctness as one bool array; every accuracy metric below reads it
+    correct_np = evaluated["correct"].to_numpy(dtype=bool) if not df.empty else np.zeros(0, dtype=bool)
+    n_eval = correct_np.size
+    n_correct = int(correct_np.sum())
+    accuracy = n_correct / n_eval if n_eval else 0.0
+
     # ---------- PROGRESS TAB ----------
     with tab_progress:
         st.success("✅ Progress tab opened! Review your analytics here, then click the **Insights** tab for AI-powered recommendations.")
@@ -901,13 +1457,10 @@ def main():
         if not st.session_state.history:
             st.info("👈 No attempts recorded yet. Answer some questions in the **Practice** tab.")
         else:
-            df = pd.DataFrame(st.session_state.history)
-
             # Overall stats with visual cards
             st.markdown("### 📈 Overall performance")
-            evaluated = df[df["evaluated"]]
             if not evaluated.empty:
-                overall_acc = evaluated["correct"].mean()
+                overall_acc = accuracy
                 
                 col1, col2, col3, col4 = st.columns(4)
                 
@@ -917,16 +1470,10 @@ def main():
                 with col2:
                     st.metric("📝 Total attempts", len(df))
                 with col3:
-                    st.metric("🎯 Correct answers", int(evaluated["correct"].sum()))
+                    st.metric("🎯 Correct answers", n_correct)
                 with col4:
                     if len(df) > 0:
-                        perfect_streak = 0
-                        for val in reversed(evaluated["correct"].values):
-                            if val:
-                                perfect_streak += 1
-                            else:
-                                break
-                        st.metric("🔥 Current streak", perfect_streak)
+                        st.metric("🔥 Current streak", _current_streak(correct_np))
             else:
                 st.write("No auto-graded questions yet (only reflection items).")
 
@@ -940,9 +1487,7 @@ def main():
                 )
                 if not acc_by_obj.empty:
                     # map IRIs to names for display
-                    obj_labels = {}
-                    for o in engine.list_objectives():
-                        obj_labels[o.iri] = o.name
+                    obj_labels = _objective_label_map()
 
                     acc_display = acc_by_obj.reset_index()
                     acc_display["objective"] = acc_display["objective_iri"].map(
@@ -950,17 +1495,9 @@ def main():
                     )
                     
                     # Create a bar chart
-                    fig = px.bar(
-                        acc_display,
-                        x="objective",
-                        y="accuracy",
-                        title="Accuracy by Objective",
-                        labels={"accuracy": "Accuracy (%)", "objective": "Objective"},
-                        color="accuracy",
-                        color_continuous_scale="RdYlGn",
-                        range_color=[0, 1]
-                    )
-                    fig.update_yaxes(tickformat=".0%")
+                    fig = _accuracy_bar(tuple(
+                        acc_display[["objective", "accuracy"]].itertuples(index=False, name=None)
+                    ))
                     st.plotly_chart(fig, use_container_width=True)
                     
                     st.dataframe(
@@ -979,25 +1516,18 @@ def main():
             # Attempts by concept
             st.markdown("### 🔬 Attempts by concept")
             attempts_by_concept = df.groupby("concept_iri").size().rename("attempts")
-            concept_rows = []
-            for iri, n in attempts_by_concept.items():
-                c = engine.describe_concept(iri)
-                concept_rows.append(
-                    {"concept": c["name"], "kind": c["kind"], "attempts": n}
-                )
+            described = _describe_concepts(tuple(attempts_by_concept.index))
+            concept_rows = [
+                {"concept": described[iri]["name"], "kind": described[iri]["kind"], "attempts": n}
+                for iri, n in attempts_by_concept.items()
+            ]
             concept_df = pd.DataFrame(concept_rows)
             
             if not concept_df.empty:
                 # Create a bar chart for attempts by concept
-                fig = px.bar(
-                    concept_df,
-                    x="concept",
-                    y="attempts",
-                    title="Practice Attempts by Concept",
-                    labels={"attempts": "Number of Attempts", "concept": "Concept"},
-                    color="attempts",
-                    color_continuous_scale="Blues"
-                )
+                fig = _attempts_bar(tuple(
+                    concept_df[["concept", "attempts"]].itertuples(index=False, name=None)
+                ))
                 st.plotly_chart(fig, use_container_width=True)
             
             st.dataframe(concept_df, use_container_width=True)
@@ -1016,9 +1546,6 @@ def main():
         if not st.session_state.history:
             st.info("👈 No attempts recorded yet. Start practicing to get personalized insights!")
         else:
-            df = pd.DataFrame(st.session_state.history)
-            evaluated = df[df["evaluated"]]
-
 
             # --- Amplified Key Metrics & Visuals ---
             st.markdown("### 📊 Key Metrics & Dynamic Visuals")
@@ -1028,7 +1555,7 @@ def main():
                 st.metric("Total Questions", len(df), help="Number of questions attempted")
             with col2:
                 if not evaluated.empty:
-                    acc = evaluated["correct"].mean() * 100
+                    acc = accuracy * 100
                     st.metric("Accuracy (%)", f"{acc:.1f}", help="Overall accuracy across all attempts")
                 else:
                     st.metric("Accuracy (%)", "N/A")
@@ -1040,19 +1567,12 @@ def main():
                     st.metric("Avg Hints", "N/A")
             with col4:
                 if len(df) > 0:
-                    study_days = len(pd.to_datetime(df["timestamp"]).dt.date.unique())
                     st.metric("Study Days", study_days, help="Unique days you practiced")
                 else:
                     st.metric("Study Days", "0")
             with col5:
                 if not evaluated.empty:
-                    streak = 0
-                    for val in reversed(evaluated["correct"].values):
-                        if val:
-                            streak += 1
-                        else:
-                            break
-                    st.metric("Current Streak", streak, help="Consecutive correct answers")
+                    st.metric("Current Streak", _current_streak(correct_np), help="Consecutive correct answers")
                 else:
                     st.metric("Current Streak", "0")
 
@@ -1062,37 +1582,20 @@ def main():
             st.markdown("### 🧠 Concept Mastery Analysis")
             if not evaluated.empty:
                 # Build aggregation dict dynamically based on available columns
-                agg_dict = {
-                    "correct": ["sum", "count", "mean"]
+                named_aggs = {
+                    "Correct": ("correct", "sum"),
+                    "Total": ("correct", "count"),
+                    "Accuracy": ("correct", "mean"),
                 }
                 if "hints_used" in evaluated.columns:
-                    agg_dict["hints_used"] = "mean"
-                
-                concept_perf = evaluated.groupby("concept_iri").agg(agg_dict)
+                    named_aggs["Avg Hints"] = ("hints_used", "mean")
                 
-                # Flatten multi-level columns
-                concept_perf.columns = ['_'.join(col).strip() if col[1] else col[0] for col in concept_perf.columns.values]
-                
-                # Rename columns to readable names
-                if "hints_used_mean" in concept_perf.columns:
-                    concept_perf = concept_perf.rename(columns={
-                        "correct_sum": "Correct",
-                        "correct_count": "Total",
-                        "correct_mean": "Accuracy",
-                        "hints_used_mean": "Avg Hints"
-                    })
-                else:
-                    concept_perf = concept_perf.rename(columns={
-                        "correct_sum": "Correct",
-                        "correct_count": "Total",
-                        "correct_mean": "Accuracy"
-                    })
-                
-                concept_perf = concept_perf.reset_index()
+                concept_perf = evaluated.groupby("concept_iri").agg(**named_aggs).reset_index()
                 
                 # Map IRIs to concept names
-                concept_perf["Concept"] = concept_perf["concept_iri"].apply(
-                    lambda iri: engine.describe_concept(iri)["name"]
+                described = _describe_concepts(tuple(concept_perf["concept_iri"]))
+                concept_perf["Concept"] = concept_perf["concept_iri"].map(
+                    {iri: c["name"] for iri, c in described.items()}
                 )
                 # Convert Accuracy to numeric and calculate Mastery %
                 concept_perf["Accuracy"] = pd.to_numeric(concept_perf["Accuracy"], errors='coerce')
@@ -1119,7 +1622,7 @@ def main():
             
             with col1:
                 if not evaluated.empty:
-                    efficiency = (evaluated["correct"].sum() / len(evaluated)) * 100
+                    efficiency = accuracy * 100
                     st.metric(
                         "Learning Efficiency",
                         f"{efficiency:.1f}%",
@@ -1142,9 +1645,10 @@ def main():
                     )
             
             with col3:
-                if not evaluated.empty and len(evaluated) > 1:
-                    first_half_acc = evaluated.iloc[:len(evaluated)//2]["correct"].mean() * 100
-                    second_half_acc = evaluated.iloc[len(evaluated)//2:]["correct"].mean() * 100
+                if n_eval > 1:
+                    half = n_eval // 2
+                    first_half_acc = correct_np[:half].mean() * 100
+                    second_half_acc = correct_np[half:].mean() * 100
                     improvement = second_half_acc - first_half_acc
                     st.metric(
                         "Learning Improvement",
@@ -1158,31 +1662,29 @@ def main():
             st.markdown("### 💭 AI-Generated Insights")
             
             # Show AI status
-            config = get_ai_api_config()
-            if config["enabled"]:
+            if _AI_ENABLED:
                 st.success("🤖 AI features enabled ✅")
             
             with st.expander("🔍 Detailed Analysis & Recommendations", expanded=True):
                 if not evaluated.empty:
-                    # Try to get AI insights first
-                    ai_insights = None
-                    if config["enabled"]:
-                        with st.spinner("Generating AI insights..."):
-                            performance_data = {
-                                "study_days": len(pd.to_datetime(df["timestamp"]).dt.date.unique()) if len(df) > 0 else 0,
-                                "total_hints": int(df["hints_used"].sum()) if "hints_used" in df.columns and len(df) > 0 else 0,
-                                "accuracy": evaluated["correct"].mean() * 100 if len(evaluated) > 0 else 0
-                            }
-                            ai_insights = generate_ai_insights(st.session_state.history, performance_data)
-                    
-                    if ai_insights:
-                        st.markdown("**🤖 AI Coach Says:**")
-                        st.markdown(f"> {ai_insights}")
-                        st.divider()
+                    # Try to get AI insights first, streamed as they are generated
+                    if _AI_ENABLED:
+                        performance_data = {
+                            "study_days": study_days,
+                            "total_hints": int(df["hints_used"].sum()) if "hints_used" in df.columns and len(df) > 0 else 0,
+                            "accuracy": accuracy * 100
+                        }
+                        insights = generate_ai_insights(st.session_state.history, performance_data)
+                        # Only show the coach header once there is something to say
+                        first = next(insights, None)
+                        if first is not None:
+                            st.markdown("**🤖 AI Coach Says:**")
+                            st.write_stream(itertools.chain((first,), insights))
+                            st.divider()
                     
                     insights_text = ""
                     
-                    overall_acc = evaluated["correct"].mean() * 100
+                    overall_acc = accuracy * 100
                     avg_hints = df["hints_used"].mean() if "hints_used" in df.columns else 0
                     
                     # Generate insights based on performance
@@ -1202,17 +1704,18 @@ def main():
                         insights_text += "💡 **Hint-Dependent Learning:** Consider attempting questions without hints first to build confidence.\n\n"
                     
                     # Question type analysis
-                    if not df[df["question_type"] == "MC"].empty:
-                        mc_acc = evaluated[evaluated["question_type"] == "MC"]["correct"].mean() * 100
+                    acc_by_qtype = evaluated.groupby("question_type")["correct"].mean() * 100
+                    if "MC" in acc_by_qtype.index:
+                        mc_acc = acc_by_qtype["MC"]
                         insights_text += f"- **Multiple Choice:** {mc_acc:.1f}% - "
                         insights_text += "Strong!" if mc_acc > 75 else "Needs work - Try to eliminate distractors more carefully.\n"
                     
-                    if not df[df["question_type"] == "NUMERIC"].empty:
-                        num_acc = evaluated[evaluated["question_type"] == "NUMERIC"]["correct"].mean() * 100
+                    if "NUMERIC" in acc_by_qtype.index:
+                        num_acc = acc_by_qtype["NUMERIC"]
                         insights_text += f"\n- **Numeric:** {num_acc:.1f}% - "
                         insights_text += "Excellent computational skills!" if num_acc > 75 else "Practice calculation accuracy.\n"
                     
-                    if not df[df["question_type"] == "REFLECTION"].empty:
+                    if "REFLECTION" in df["question_type"].values:
                         insights_text += f"\n- **Reflection:** Think deeply about the conceptual understanding behind each topic.\n"
                     
                     st.markdown(insights_text)
@@ -1220,29 +1723,13 @@ def main():
                     st.info("Complete more questions to generate personalized insights")
             
             # AI Question Generator
-            if config["enabled"]:
+            if _AI_ENABLED:
                 st.divider()
                 st.markdown("### 🚀 Generate AI Questions")
                 
 
                 # --- Adaptive Difficulty Suggestion ---
-                def suggest_difficulty():
-                    df = pd.DataFrame(st.session_state.history)
-                    evaluated = df[df.get("evaluated", False)] if not df.empty else pd.DataFrame()
-                    if evaluated.empty or len(evaluated) < 5:
-                        return "Medium"  # Not enough data, default to Medium
-                    acc = evaluated["correct"].mean()
-                    avg_hints = evaluated["hints_used"].mean() if "hints_used" in evaluated else 0
-                    # If accuracy is high and hints are low, suggest Hard
-                    if acc >= 0.85 and avg_hints < 1:
-                        return "Hard"
-                    # If accuracy is moderate, suggest Medium
-                    if acc >= 0.6:
-                        return "Medium"
-                    # If accuracy is low or hints are high, suggest Easy
-                    return "Easy"
-
-                adaptive_difficulty = suggest_difficulty()
+                adaptive_difficulty = suggest_difficulty(evaluated)
                 col1, col2, col3 = st.columns(3)
                 with col1:
                     concept = st.text_input("Concept to practice:", value="Graph Neural Networks")
@@ -1256,8 +1743,11 @@ def main():
                     generate_btn = st.button("Generate Question", key="ai_gen_btn")
 
                 if generate_btn and concept:
+                    # Each click asks for a new variant; the counter keeps
+                    # variants stable (and cached) across sessions.
+                    st.session_state["ai_gen_seed"] = st.session_state.get("ai_gen_seed", 0) + 1
                     with st.spinner(f"Creating {difficulty} question on {concept}..."):
-                        ai_question = generate_ai_question(concept, difficulty.lower())
+                        ai_question = generate_ai_question(concept, difficulty.lower(), seed=st.session_state["ai_gen_seed"])
                         
                         if ai_question:
                             st.success("✅ Question generated!")
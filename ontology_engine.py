@@ -1,22 +1,138 @@
 # ontology_engine.py
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+import os
+import threading
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Tuple
 
-from owlready2 import get_ontology, Thing
+from owlready2 import World, get_ontology, Thing
 
-ONTO_PATH = "ont.rdf"  # adjust if needed
+# Resolved next to this module so the working directory does not matter
+_HERE = os.path.dirname(os.path.abspath(__file__))
+ONTO_PATH = os.path.join(_HERE, "ont.rdf")  # adjust if needed
+WORLD_PATH = os.path.join(_HERE, "ont.sqlite3")  # parsed copy of ONTO_PATH; None to always parse
 
 class OntologyEngine:
 
-    def __init__(self, path: str = ONTO_PATH):
-        self.onto = get_ontology(path).load()
+    # Concept kinds reported by describe_concept, in order of precedence
+    _KINDS = (
+        "GNNConcept",
+        "GraphDataset",
+        "GraphType",
+        "GraphInstance",
+        "LossFunction",
+        "AccuracyMetric",
+    )
+    # Meta-data fields reported as concept details, per class
+    _DETAIL_FIELDS = (
+        ("GraphDataset", ("datasetName", "numGraphs", "numNodeFeatures", "sourceURL")),
+        ("GraphInstance", ("graphLabel", "matrixSize", "numNodes", "numEdges")),
+    )
+
+    def __init__(self, path: str = ONTO_PATH, world_path: Optional[str] = WORLD_PATH):
+        if world_path:
+            # The SQLite-backed world keeps the parsed quadstore between runs;
+            # the RDF is only parsed again when it is newer than that copy.
+            world = World(filename=world_path, exclusive=False)
+            onto = world.get_ontology(path)
+            # 0 when the world holds no stored copy of the ontology yet
+            stored_at = onto.graph.get_last_update_time()
+            self.onto = onto.load(reload_if_newer=True)
+            if not stored_at or onto.graph.get_last_update_time() != stored_at:
+                # Only commit when owlready actually (re)parsed the RDF
+                world.save()
+        else:
+            self.onto = get_ontology(path).load()
 
         # Namespaces (co-ode for properties/individuals, gnn-its for core classes)
         self.O = self.onto.get_namespace("http://www.co-ode.org/ontologies/ont.owl#")
         self.G = self.onto.get_namespace("http://www.example.org/gnn-its#")
 
+        # Core classes, resolved once rather than through the namespace per use
+        self._LearningObjective = self.G.LearningObjective
+        self._LearningTask = self.G.LearningTask
+        self._Assessment = self.G.Assessment
+        self._kind_classes = {kind: getattr(self.G, kind) for kind in self._KINDS}
+
+        # IRI-keyed memos, per engine so cached results never outlive it
+        self._objective_info_by_iri = lru_cache(maxsize=1024)(self._objective_info_for_iri)
+        self._describe_concept_by_iri = lru_cache(maxsize=4096)(self._describe_concept)
+
+        self._build_indexes()
+
+    # ---------- caches ----------
+
+    def _build_indexes(self) -> None:
+        """Index individuals by IRI, and tasks/assessments by objective IRI."""
+        self._type_cache: Dict[str, str] = {}
+        # Every subclass of a concept kind maps to the kinds it falls under
+        self._kinds_by_class: Dict[Any, frozenset] = {}
+        for kind, kind_cls in self._kind_classes.items():
+            for cls in kind_cls.descendants():
+                self._kinds_by_class[cls] = self._kinds_by_class.get(cls, frozenset()) | {kind}
+
+        self._by_iri: Dict[str, Thing] = {i.iri: i for i in self.onto.individuals()}
+        self._objectives_cache: Tuple[ObjectiveInfo, ...] = tuple(
+            self.objective_info(o) for o in self._LearningObjective.instances()
+        )
+
+        self._concept_details: Dict[str, Dict[str, Any]] = {}
+        for cls_name, attrs in self._DETAIL_FIELDS:
+            for c in self._kind_classes[cls_name].instances():
+                props = self._bulk_props(c)
+                details = self._concept_details.setdefault(c.iri, {})
+                for attr in attrs:
+                    details[attr] = self._first(props, attr)
+
+        # Stored as tuples so objective pages can share them without copying.
+        # Every known objective gets an entry, so only objectives added after
+        # load fall through to a store search.
+        targets = self._objects_by_subject("targetsObjective")
+        tasks_by_obj: Dict[str, List[LazyTaskInfo]] = {o.iri: [] for o in self._objectives_cache}
+        for t in self._LearningTask.instances():
+            info = LazyTaskInfo(self, t)
+            for o in targets.get(t, ()):
+                tasks_by_obj.setdefault(o.iri, []).append(info)
+        self._tasks_by_obj: Dict[str, Tuple[LazyTaskInfo, ...]] = {
+            iri: tuple(tasks) for iri, tasks in tasks_by_obj.items()
+        }
+
+        assesses = self._objects_by_subject("assessesObjective")
+        assessments_by_obj: Dict[str, List[AssessmentInfo]] = {o.iri: [] for o in self._objectives_cache}
+        for a in self._Assessment.instances():
+            info = self.assessment_info(a)
+            for o in assesses.get(a, ()):
+                assessments_by_obj.setdefault(o.iri, []).append(info)
+        self._assessments_by_obj: Dict[str, Tuple[AssessmentInfo, ...]] = {
+            iri: tuple(assessments) for iri, assessments in assessments_by_obj.items()
+        }
+
+    def _objects_by_subject(self, prop: str) -> Dict[Thing, List[Thing]]:
+        """Subject -> objects for every triple of ``prop``, from one SPARQL query."""
+        # targetsObjective/assessesObjective declare no inverse, so the
+        # reverse lookup is answered by the store's predicate index instead
+        pairs: Dict[Thing, List[Thing]] = {}
+        query = f"SELECT ?s ?o WHERE {{ ?s <{self.O.base_iri}{prop}> ?o . }}"
+        for subj, obj in self.onto.world.sparql(query):
+            pairs.setdefault(subj, []).append(obj)
+        return pairs
+
+    def _lookup(self, iri: str) -> Optional[Thing]:
+        # Fall back to a store query for entities missing from the index,
+        # e.g. classes or individuals added after load
+        thing = self._by_iri.get(iri)
+        if thing is None:
+            thing = self.onto.search_one(iri=iri)
+        return thing
+
+    def clear_caches(self) -> None:
+        """Rebuild cached lookups, e.g. after the ontology is reloaded."""
+        self._objective_info_by_iri.cache_clear()
+        self._describe_concept_by_iri.cache_clear()
+        self._build_indexes()
+
     # ---------- utility ----------
 
     @staticmethod
@@ -31,6 +147,21 @@ class OntologyEngine:
     def _get_all(obj: Thing, attr: str) -> List[Any]:
         return list(getattr(obj, attr, []))
 
+    def _bulk_props(self, obj: Thing) -> Dict[str, List[Any]]:
+        """All property values of ``obj`` from one store query, keyed by property name."""
+        props: Dict[str, List[Any]] = {}
+        for p, o in self.onto.world.sparql("SELECT ?p ?o WHERE { ?? ?p ?o . }", [obj]):
+            name = getattr(p, "python_name", None)
+            if name:
+                props.setdefault(name, []).append(o)
+        return props
+
+    @staticmethod
+    def _first(props: Dict[str, List[Any]], attr: str) -> Optional[Any]:
+        """Return first value of ``attr`` in a _bulk_props dict or None."""
+        vals = props.get(attr)
+        return vals[0] if vals else None
+
     @staticmethod
     def _label(obj: Thing) -> str:
         # owlready2 usually exposes `name`; rdfs:label could also be used.
@@ -38,102 +169,125 @@ class OntologyEngine:
 
     # ---------- objectives ----------
 
-    def list_objectives(self) -> List[ObjectiveInfo]:
-        objs = list(self.G.LearningObjective.instances())
-        return [self.objective_info(o) for o in objs]
+    def list_objectives(self) -> Tuple[ObjectiveInfo, ...]:
+        return self._objectives_cache
 
     def objective_info(self, obj: Thing) -> ObjectiveInfo:
+        return self._objective_info_by_iri(obj.iri)
+
+    def _objective_info_for_iri(self, iri: str) -> ObjectiveInfo:
+        obj = self._lookup(iri)
+        props = self._bulk_props(obj)
         return ObjectiveInfo(
             iri=obj.iri,
             name=self._label(obj),
-            description=self._get_single(obj, "objectiveDescription"),
-            level=self._get_single(obj, "objectiveLevel"),
+            description=self._first(props, "objectiveDescription"),
+            level=self._first(props, "objectiveLevel"),
         )
 
     def get_objective_by_iri(self, iri: str) -> Optional[Thing]:
-        return self.onto.search_one(iri=iri)
+        return self._lookup(iri)
 
     # ---------- tasks / learning activities ----------
 
-    def tasks_for_objective(self, obj: Thing) -> List[TaskInfo]:
-        tasks = []
-        for t in self.G.LearningTask.instances():
-            if obj in list(getattr(t, "targetsObjective", [])):
-                tasks.append(self.task_info(t))
+    def tasks_for_objective(self, obj: Thing) -> Iterator[LazyTaskInfo]:
+        yield from self._tasks_of(obj)
+
+    def _tasks_of(self, obj: Thing) -> Tuple[LazyTaskInfo, ...]:
+        tasks = self._tasks_by_obj.get(obj.iri)
+        if tasks is None:
+            # Objective added after load: let owlready answer from its
+            # property index
+            tasks = tuple(
+                LazyTaskInfo(self, t)
+                for t in self.onto.search(type=self._LearningTask, targetsObjective=obj)
+            )
         return tasks
 
-    def task_info(self, t: Thing) -> TaskInfo:
+    def _type_name(self, t: Thing) -> str:
         # class name for type: e.g. ConceptExplanation, WorkedExample...
-        type_name = t.is_a[0].name if t.is_a else "LearningTask"
+        name = self._type_cache.get(t.iri)
+        if name is None:
+            name = self._type_cache[t.iri] = t.is_a[0].name if t.is_a else "LearningTask"
+        return name
+
+    def task_info(self, t: Thing) -> TaskInfo:
+        type_name = self._type_name(t)
+        props = self._bulk_props(t)
 
         return TaskInfo(
             iri=t.iri,
             name=self._label(t),
             type_name=type_name,
-            description=self._get_single(t, "taskDescription"),
-            difficulty=self._get_single(t, "taskDifficultyLevel"),
-            estimated_time=self._get_single(t, "estimatedCompletionTime"),
-            requires_coding=bool(self._get_single(t, "requiresCoding") or False),
-            concept_iris=[c.iri for c in self._get_all(t, "teachesConcept")],
-            graph_iris=[g.iri for g in self._get_all(t, "producesGraph")],
-            dataset_iris=[d.iri for d in self._get_all(t, "usesGraphDataset")],
+            description=self._first(props, "taskDescription"),
+            difficulty=self._first(props, "taskDifficultyLevel"),
+            estimated_time=self._first(props, "estimatedCompletionTime"),
+            requires_coding=bool(self._first(props, "requiresCoding") or False),
+            concept_iris=[c.iri for c in props.get("teachesConcept", [])],
+            graph_iris=[g.iri for g in props.get("producesGraph", [])],
+            dataset_iris=[d.iri for d in props.get("usesGraphDataset", [])],
         )
 
     # ---------- assessments ----------
 
-    def assessments_for_objective(self, obj: Thing) -> List[AssessmentInfo]:
-        assessments = []
-        for a in self.G.Assessment.instances():
-            if obj in list(getattr(a, "assessesObjective", [])):
-                assessments.append(self.assessment_info(a))
+    def assessments_for_objective(self, obj: Thing) -> Iterator[AssessmentInfo]:
+        yield from self._assessments_of(obj)
+
+    def _assessments_of(self, obj: Thing) -> Tuple[AssessmentInfo, ...]:
+        assessments = self._assessments_by_obj.get(obj.iri)
+        if assessments is None:
+            assessments = tuple(
+                self.assessment_info(a)
+                for a in self.onto.search(type=self._Assessment, assessesObjective=obj)
+            )
         return assessments
 
     def assessment_info(self, a: Thing) -> AssessmentInfo:
+        props = self._bulk_props(a)
         return AssessmentInfo(
             iri=a.iri,
             name=self._label(a),
-            description=self._get_single(a, "assessmentDescription"),
-            current_score=self._get_single(a, "currentScore"),
-            max_score=self._get_single(a, "maxScore"),
-            passing_score=self._get_single(a, "passingScore"),
-            required_concepts=[c.iri for c in self._get_all(a, "requiresConcept")],
+            description=self._first(props, "assessmentDescription"),
+            current_score=self._first(props, "currentScore"),
+            max_score=self._first(props, "maxScore"),
+            passing_score=self._first(props, "passingScore"),
+            required_concepts=[c.iri for c in props.get("requiresConcept", [])],
         )
 
+    # ---------- objective pages ----------
+
+    def bundle_for_objective(
+        self, iri: str
+    ) -> Tuple[Optional[ObjectiveInfo], Tuple[LazyTaskInfo, ...], Tuple[AssessmentInfo, ...]]:
+        """Objective info, tasks and assessments for one objective, in one call.
+
+        The task and assessment tuples are the engine's own index entries,
+        so callers that only need part of the bundle pay nothing for the rest.
+        """
+        obj = self._lookup(iri)
+        if obj is None:
+            return None, (), ()
+        return self.objective_info(obj), self._tasks_of(obj), self._assessments_of(obj)
+
     # ---------- descriptive helpers for UI ----------
 
     def describe_concept(self, iri: str) -> Dict[str, Any]:
-        c = self.onto.search_one(iri=iri)
+        # Copy out of the memo so callers cannot edit the cached entry
+        described = self._describe_concept_by_iri(iri)
+        return {**described, "details": dict(described["details"])}
+
+    def _describe_concept(self, iri: str) -> Dict[str, Any]:
+        c = self._lookup(iri)
         if not c:
             return {"iri": iri, "name": iri, "kind": "Unknown", "details": {}}
 
         # kind: GNNConcept / GraphDataset / GraphType / GraphInstance / LossFunction / AccuracyMetric, etc.
-        kind = "Thing"
-        for cls in (
-            self.G.GNNConcept,
-            self.G.GraphDataset,
-            self.G.GraphType,
-            self.G.GraphInstance,
-            self.G.LossFunction,
-            self.G.AccuracyMetric,
-        ):
-            if isinstance(c, cls):
-                kind = cls.name
-                break
-
-        details = {}
-        # GraphDataset meta-data, if present
-        if isinstance(c, self.G.GraphDataset):
-            details["datasetName"] = self._get_single(c, "datasetName")
-            details["numGraphs"] = self._get_single(c, "numGraphs")
-            details["numNodeFeatures"] = self._get_single(c, "numNodeFeatures")
-            details["sourceURL"] = self._get_single(c, "sourceURL")
-
-        # GraphInstance meta-data
-        if isinstance(c, self.G.GraphInstance):
-            details["graphLabel"] = self._get_single(c, "graphLabel")
-            details["matrixSize"] = self._get_single(c, "matrixSize")
-            details["numNodes"] = self._get_single(c, "numNodes")
-            details["numEdges"] = self._get_single(c, "numEdges")
+        kinds = set()
+        for cls in (c.is_a if isinstance(c, Thing) else ()):
+            kinds.update(self._kinds_by_class.get(cls, ()))
+        kind = next((k for k in self._KINDS if k in kinds), "Thing")
+
+        details = dict(self._concept_details.get(c.iri, {}))
 
         return {
             "iri": c.iri,
@@ -142,6 +296,29 @@ class OntologyEngine:
             "details": details,
         }
 
+    def describe_concepts(self, iris: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Describe several concepts in one call, keyed by IRI."""
+        return {iri: self.describe_concept(iri) for iri in dict.fromkeys(iris)}
+
+
+# ---------- Shared engine ----------
+
+_ENGINE: Optional[OntologyEngine] = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def get_engine() -> OntologyEngine:
+    """Return the process-wide engine for ONTO_PATH, loading it on first use.
+
+    Construct an OntologyEngine directly for any other ontology.
+    """
+    global _ENGINE
+    if _ENGINE is None:
+        with _ENGINE_LOCK:
+            if _ENGINE is None:
+                _ENGINE = OntologyEngine()
+    return _ENGINE
+
 
 # ---------- Dataclasses (defined outside class) ----------
 
@@ -167,6 +344,38 @@ class TaskInfo:
     dataset_iris: List[str]
 
 
+class LazyTaskInfo:
+    """TaskInfo stand-in that reads the task's other fields on first use.
+
+    ``iri`` and ``name`` are set up front for list views; anything else
+    resolves the full TaskInfo once. Pickles as a plain TaskInfo.
+    """
+
+    __slots__ = ("_engine", "_t", "_info", "iri", "name")
+
+    def __init__(self, engine: OntologyEngine, t: Thing):
+        self._engine = engine
+        self._t = t
+        self._info: Optional[TaskInfo] = None
+        self.iri = t.iri
+        self.name = engine._label(t)
+
+    def _resolve(self) -> TaskInfo:
+        if self._info is None:
+            self._info = self._engine.task_info(self._t)
+        return self._info
+
+    def __getattr__(self, attr: str) -> Any:
+        # Only reached for attributes not held in a slot
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self._resolve(), attr)
+
+    def __reduce__(self):
+        info = self._resolve()
+        return TaskInfo, tuple(getattr(info, f.name) for f in fields(TaskInfo))
+
+
 @dataclass
 class AssessmentInfo:
     iri: str
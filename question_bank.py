@@ -1,28 +1,59 @@
 # question_bank.py
+from __future__ import annotations
+
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Tuple
 
 # -----------------------------
 # Define ALL IRIs *before* using them
 # -----------------------------
 
-OBJ_UNDERSTAND_GRAPH_REP = "http://www.co-ode.org/ontologies/ont.owl#ObjUnderstandGraphRep"
-OBJ_TRAIN_GCN = "http://www.co-ode.org/ontologies/ont.owl#ObjTrainGCNModel"
-OBJ_EVAL_GRAPH_ACC = "http://www.co-ode.org/ontologies/ont.owl#ObjEvaluateGraphAccuracy"
-OBJ_IMPLEMENT_MESSAGE_PASSING = "http://www.co-ode.org/ontologies/ont.owl#ObjImplementMessagePassing"
+OBJ_UNDERSTAND_GRAPH_REP = sys.intern("http://www.co-ode.org/ontologies/ont.owl#ObjUnderstandGraphRep")
+OBJ_TRAIN_GCN = sys.intern("http://www.co-ode.org/ontologies/ont.owl#ObjTrainGCNModel")
+OBJ_EVAL_GRAPH_ACC = sys.intern("http://www.co-ode.org/ontologies/ont.owl#ObjEvaluateGraphAccuracy")
+OBJ_IMPLEMENT_MESSAGE_PASSING = sys.intern("http://www.co-ode.org/ontologies/ont.owl#ObjImplementMessagePassing")
 
-TASK_EXPLAIN_ADJ = "http://www.co-ode.org/ontologies/ont.owl#ExplainAdjacencyMatrixConcept"
-TASK_INTERACTIVE_AGG = "http://www.co-ode.org/ontologies/ont.owl#InteractiveNodeAggregationExercise"
-TASK_WORKED_GCN = "http://www.co-ode.org/ontologies/ont.owl#WorkedExampleGCNForwardPass"
+TASK_EXPLAIN_ADJ = sys.intern("http://www.co-ode.org/ontologies/ont.owl#ExplainAdjacencyMatrixConcept")
+TASK_INTERACTIVE_AGG = sys.intern("http://www.co-ode.org/ontologies/ont.owl#InteractiveNodeAggregationExercise")
+TASK_WORKED_GCN = sys.intern("http://www.co-ode.org/ontologies/ont.owl#WorkedExampleGCNForwardPass")
 
-CONCEPT_BASIC_REP = "http://www.co-ode.org/ontologies/ont.owl#BasicGraphRepresentation"
-CONCEPT_GCN_FUND = "http://www.co-ode.org/ontologies/ont.owl#GCNLayerFundamentals"
-CONCEPT_TRAIN_WORKFLOW = "http://www.co-ode.org/ontologies/ont.owl#TrainingWorkflowConcept"
+CONCEPT_BASIC_REP = sys.intern("http://www.co-ode.org/ontologies/ont.owl#BasicGraphRepresentation")
+CONCEPT_GCN_FUND = sys.intern("http://www.co-ode.org/ontologies/ont.owl#GCNLayerFundamentals")
+CONCEPT_TRAIN_WORKFLOW = sys.intern("http://www.co-ode.org/ontologies/ont.owl#TrainingWorkflowConcept")
 
 
 # -----------------------------
 # Question definitions
 # -----------------------------
 
-QUESTIONS = {
+@dataclass(frozen=True, slots=True)
+class Question:
+    objective_iri: str
+    task_iri: str
+    concept_iri: str
+    type: str
+    prompt: str
+    hints: Tuple[str, ...]
+    # MC choices as parallel tuples; bit i of the mask marks choice i correct
+    mc_ids: Tuple[str, ...] = ()
+    mc_texts: Tuple[str, ...] = ()
+    mc_correct_mask: int = 0
+    numeric_answer: Optional[float] = None
+    numeric_tolerance: Optional[float] = None
+
+    @property
+    def mc_choices(self) -> Tuple[Dict[str, Any], ...]:
+        """MC choices in the older ``{"id", "text", "correct"}`` dict shape."""
+        return tuple(
+            {"id": choice_id, "text": text, "correct": bool(self.mc_correct_mask >> i & 1)}
+            for i, (choice_id, text) in enumerate(zip(self.mc_ids, self.mc_texts))
+        )
+
+
+_RAW_QUESTIONS = {
     "Q1_adj_matrix_mc": {
         "objective_iri": OBJ_UNDERSTAND_GRAPH_REP,
         "task_iri": TASK_EXPLAIN_ADJ,
@@ -32,12 +63,14 @@ QUESTIONS = {
             "In an adjacency matrix for an *unweighted* directed graph, "
             "what does a value of **1** at position (i, j) represent?"
         ),
-        "mc_choices": [
-            {"id": "A", "text": "There is an edge from node i to node j", "correct": True},
-            {"id": "B", "text": "Nodes i and j have the same degree", "correct": False},
-            {"id": "C", "text": "There is a path of length 2 between i and j", "correct": False},
-            {"id": "D", "text": "The graph has exactly one connected component", "correct": False},
-        ],
+        "mc_ids": ("A", "B", "C", "D"),
+        "mc_texts": (
+            "There is an edge from node i to node j",
+            "Nodes i and j have the same degree",
+            "There is a path of length 2 between i and j",
+            "The graph has exactly one connected component",
+        ),
+        "mc_correct_mask": 0b0001,  # A
         "hints": [
             "Think about how we encode the *presence* or *absence* of edges in a matrix.",
             "Look at row i and column j: what relationship between those nodes are we recording?",
@@ -89,12 +122,14 @@ QUESTIONS = {
         "prompt": (
             "In a typical message passing step of a GNN, what does the aggregation function do?"
         ),
-        "mc_choices": [
-            {"id": "A", "text": "It updates the graph labels", "correct": False},
-            {"id": "B", "text": "It combines information from a node's neighbors", "correct": True},
-            {"id": "C", "text": "It trains the model using gradient descent", "correct": False},
-            {"id": "D", "text": "It converts graphs into images", "correct": False},
-        ],
+        "mc_ids": ("A", "B", "C", "D"),
+        "mc_texts": (
+            "It updates the graph labels",
+            "It combines information from a node's neighbors",
+            "It trains the model using gradient descent",
+            "It converts graphs into images",
+        ),
+        "mc_correct_mask": 0b0010,  # B
         "hints": [
             "Messages come from neighboring nodes.",
             "What must a node do with multiple incoming messages?",
@@ -118,3 +153,38 @@ QUESTIONS = {
         ],
     },
 }
+
+
+# -----------------------------
+# Freeze
+# -----------------------------
+
+# IRIs are interned so comparisons with the constants above can short-circuit
+# on identity; the bank itself is read-only.
+for _q in _RAW_QUESTIONS.values():
+    for _key in ("objective_iri", "task_iri", "concept_iri"):
+        _q[_key] = sys.intern(_q[_key])
+del _q, _key
+
+QUESTIONS = MappingProxyType({
+    qid: Question(**{**data, "hints": tuple(data["hints"])})
+    for qid, data in _RAW_QUESTIONS.items()
+})
+
+
+# -----------------------------
+# Lookups by IRI
+# -----------------------------
+
+_by_objective = defaultdict(list)
+_by_concept = defaultdict(list)
+_by_task = defaultdict(list)
+for _qid, _q in QUESTIONS.items():
+    _by_objective[_q.objective_iri].append(_qid)
+    _by_concept[_q.concept_iri].append(_qid)
+    _by_task[_q.task_iri].append(_qid)
+del _qid, _q
+
+QUESTIONS_BY_OBJECTIVE = dict(_by_objective)
+QUESTIONS_BY_CONCEPT = dict(_by_concept)
+QUESTIONS_BY_TASK = dict(_by_task)